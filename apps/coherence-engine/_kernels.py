@@ -0,0 +1,92 @@
+import math
+from typing import Tuple
+
+import numba as nb
+import numpy as np
+
+
+@nb.njit(cache=True, fastmath=True)
+def _fft_radix2(re: np.ndarray, im: np.ndarray) -> None:
+    """In-place iterative radix-2 FFT; len(re) must be a power of two."""
+    n = re.shape[0]
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            re[i], re[j] = re[j], re[i]
+            im[i], im[j] = im[j], im[i]
+    size = 2
+    while size <= n:
+        half = size // 2
+        theta = -2.0 * math.pi / size
+        for k in range(half):
+            wr = math.cos(theta * k)
+            wi = math.sin(theta * k)
+            for start in range(0, n, size):
+                a = start + k
+                b = a + half
+                tr = re[b] * wr - im[b] * wi
+                ti = re[b] * wi + im[b] * wr
+                re[b] = re[a] - tr
+                im[b] = im[a] - ti
+                re[a] += tr
+                im[a] += ti
+        size *= 2
+
+
+# error_model="numpy" keeps IEEE division: a bin with no power gives NaN coherence,
+# as scipy.signal.coherence and the NumPy fallback do, instead of raising.
+# No nnan/ninf fast-math flags, so that NaN survives the reduction.
+@nb.njit(cache=True, fastmath={"contract", "reassoc"}, error_model="numpy", nogil=True)
+def batched_coherence(returns: np.ndarray, nperseg: int, noverlap: int,
+                      window: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch cross-spectral reduction for every pair of rows in `returns`.
+    Returns (mean magnitude-squared coherence of shape (n, n),
+    segment-summed power spectra of shape (n, nperseg // 2 + 1)).
+    """
+    nsym, nsamp = returns.shape
+    step = nperseg - noverlap
+    nseg = (nsamp - noverlap) // step
+    nfreq = nperseg // 2 + 1
+    # Segments innermost so the pair reduction walks contiguous memory
+    spec_re = np.empty((nsym, nfreq, nseg))
+    spec_im = np.empty((nsym, nfreq, nseg))
+    pxx = np.zeros((nsym, nfreq))
+
+    re = np.empty(nperseg)
+    im = np.empty(nperseg)
+    for i in range(nsym):
+        for s in range(nseg):
+            start = s * step
+            mean = 0.0
+            for k in range(nperseg):
+                mean += returns[i, start + k]
+            mean /= nperseg
+            for k in range(nperseg):
+                re[k] = (returns[i, start + k] - mean) * window[k]
+                im[k] = 0.0
+            _fft_radix2(re, im)
+            for f in range(nfreq):
+                spec_re[i, f, s] = re[f]
+                spec_im[i, f, s] = im[f]
+                pxx[i, f] += re[f] * re[f] + im[f] * im[f]
+
+    coh = np.empty((nsym, nsym))
+    for i in range(nsym):
+        for j in range(i, nsym):
+            acc = 0.0
+            for f in range(nfreq):
+                cr = 0.0
+                ci = 0.0
+                for s in range(nseg):
+                    cr += spec_re[i, f, s] * spec_re[j, f, s] + spec_im[i, f, s] * spec_im[j, f, s]
+                    ci += spec_im[i, f, s] * spec_re[j, f, s] - spec_re[i, f, s] * spec_im[j, f, s]
+                acc += (cr * cr + ci * ci) / (pxx[i, f] * pxx[j, f])
+            coh[i, j] = acc / nfreq
+            coh[j, i] = coh[i, j]
+    return coh, pxx
@@ -1,7 +1,15 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+
 import numpy as np
-import pandas as pd
-from scipy.signal import coherence, welch
-from typing import List, Dict, Any, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import rfft
+from scipy.signal import get_window
+from typing import List, Dict, Any, Sequence, Tuple
+
+from _kernels import batched_coherence
 
 # Sector Mapping for Fractal Analysis
 SECTORS = {
@@ -12,35 +20,118 @@ SECTORS = {
     "Energy": ["XOM", "CVX", "SLB"]
 }
 
-def fetch_real_data(symbol: str, count: int = 128) -> Optional[pd.DataFrame]:
-    """Mock data fetcher with consistent seed for testing."""
-    np.random.seed(hash(symbol) % 1000)
-    base = 100 + np.cumsum(np.random.randn(count) * 0.5)
+# Panel row layout: reports fetch ALL_SYMBOLS in this order
+ALL_SYMBOLS = tuple(sym for symbols in SECTORS.values() for sym in symbols)
+SYM_INDEX = {sym: row for row, sym in enumerate(ALL_SYMBOLS)}
+SECTOR_ROWS = {sector: np.array([SYM_INDEX[sym] for sym in symbols], dtype=np.intp)
+               for sector, symbols in SECTORS.items()}
+NON_MACRO_SECTORS = tuple((sector, tuple(symbols)) for sector, symbols in SECTORS.items() if sector != "Macro")
+MICRO_SYMBOLS = tuple(sym for _, symbols in NON_MACRO_SECTORS for sym in symbols)
+MICRO_ROWS = np.array([SYM_INDEX[sym] for sym in MICRO_SYMBOLS], dtype=np.intp)
+
+@lru_cache(maxsize=256)
+def _fetch_series(symbol: str, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Cached (close, volume) arrays for a symbol; read-only since they are shared across requests."""
+    rng = np.random.default_rng(hash(symbol) & 0xFFFFFFFF)
+    noise = rng.standard_normal((2, count), dtype=np.float32)
+    base = 100 + np.cumsum(noise[0] * 0.5)
     if any(symbol in SECTORS[s] for s in ["Macro", "Tech"]):
-        base += np.arange(count) * 0.05
-    volume = 1000 + np.abs(np.random.randn(count) * 100) + (base / 10)
-    return pd.DataFrame({'close': base, 'volume': volume})
+        base += np.arange(count, dtype=np.float32) * 0.05
+    volume = 1000 + np.abs(noise[1] * 100) + (base / 10)
+    base.setflags(write=False)
+    volume.setflags(write=False)
+    return base, volume
+
+async def fetch_panel(symbols: Sequence[str], count: int = 128) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mock data fetcher with consistent seed for testing.
+    Returns (closes, volumes): float32 arrays of shape (len(symbols), count),
+    one row per symbol in the given order. Symbols are fetched concurrently.
+    """
+    series = await asyncio.gather(*(asyncio.to_thread(_fetch_series, sym, count) for sym in symbols))
+    closes = np.empty((len(symbols), count), dtype=np.float32)
+    volumes = np.empty_like(closes)
+    for row, (close, volume) in enumerate(series):
+        closes[row], volumes[row] = close, volume
+    return closes, volumes
+
+def _log_returns(series: np.ndarray) -> np.ndarray:
+    """Log-returns along the last axis, in the input's precision."""
+    # log of the price ratio, not a difference of logs: log(p) of prices in the thousands
+    # and up shares most of its digits between neighbours and cancels in the diff
+    series = np.asarray(series)
+    return np.log(series[..., 1:] / series[..., :-1])
+
+@lru_cache(maxsize=8)
+def _hann_window(nperseg: int, dtype: np.dtype) -> np.ndarray:
+    """Periodic Hann window as used by scipy's Welch estimators, shared read-only."""
+    window = get_window("hann", nperseg).astype(dtype)
+    window.setflags(write=False)
+    return window
+
+class SpectralPanel:
+    """
+    Welch spectra for a stack of equal-length log-return series, reduced in one batch.
+    Follows the scipy.signal.welch/coherence defaults (Hann window, 50% overlap,
+    constant detrend) so every pair shares the same segmented spectra.
+    """
+
+    def __init__(self, returns: np.ndarray, nperseg: int = 64):
+        returns = np.ascontiguousarray(returns)
+        self.nperseg = min(returns.shape[-1], nperseg)
+        noverlap = self.nperseg // 2
+        window = _hann_window(self.nperseg, returns.dtype)
+        if self.nperseg & (self.nperseg - 1) == 0:
+            # Compiled kernel: segmenting, radix-2 FFTs and pair reductions in one pass
+            self._coherence, psd = batched_coherence(returns, self.nperseg, noverlap, window)
+        else:
+            self._coherence, psd = self._rfft_spectra(returns, self.nperseg, noverlap, window)
+        # One-sided PSD: every bin but DC (and Nyquist, for even lengths) holds two sides
+        if self.nperseg % 2:
+            psd[:, 1:] *= 2
+        else:
+            psd[:, 1:-1] *= 2
+        self.psd = psd
+
+    @staticmethod
+    def _rfft_spectra(returns: np.ndarray, nperseg: int, noverlap: int,
+                      window: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """NumPy fallback for lengths the radix-2 kernel cannot take."""
+        segments = sliding_window_view(returns, nperseg, axis=-1)[:, ::nperseg - noverlap]
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+        # X[series, segment, frequency]
+        X = rfft(segments * window, axis=-1, workers=-1)
+        cross = np.einsum("isf,jsf->ijf", X, X.conj())
+        power = np.diagonal(cross, axis1=0, axis2=1).real.T
+        # Series with no power in a bin give NaN, matching scipy.signal.coherence
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cxy = np.abs(cross) ** 2 / (power[:, None, :] * power[None, :, :])
+        return cxy.mean(axis=-1), power.copy()
+
+    def coherence_matrix(self) -> np.ndarray:
+        """Mean magnitude-squared coherence for every pair of series, shape (n, n)."""
+        return self._coherence
+
+    def concentration(self) -> np.ndarray:
+        """Peak-to-total power ratio of each series' one-sided PSD."""
+        peak = self.psd.max(axis=-1)
+        total = self.psd.sum(axis=-1)
+        return np.divide(peak, total, out=np.zeros_like(peak), where=total > 0)
 
 def calculate_coherence(s1: np.ndarray, s2: np.ndarray) -> float:
     """Calculates average coherence between two signals."""
     min_len = min(len(s1), len(s2))
     if min_len < 32: return 0.0
-    r1 = np.diff(np.log(s1[:min_len]))
-    r2 = np.diff(np.log(s2[:min_len]))
-    f, Cxy = coherence(r1, r2, fs=1.0, nperseg=min(len(r1), 64))
-    return float(np.mean(Cxy))
+    panel = SpectralPanel(_log_returns(np.stack([s1[:min_len], s2[:min_len]])))
+    return float(panel.coherence_matrix()[0, 1])
 
 def calculate_resonance_stability(series: np.ndarray) -> float:
     """
     Measures 'Faraday Resonance' stability.
     High stability indicates a 'standing wave' thought pattern in the market.
     """
-    returns = np.diff(np.log(series))
-    f, psd = welch(returns, fs=1.0, nperseg=min(len(returns), 64))
     # Stability is the ratio of peak power to total power (Spectral Centroid/Concentration)
-    peak_power = np.max(psd)
-    total_power = np.sum(psd)
-    return float(peak_power / total_power) if total_power > 0 else 0.0
+    return float(SpectralPanel(_log_returns(series)[None]).concentration()[0])
 
 def calculate_hemispheric_coupling(buy_side: np.ndarray, sell_side: np.ndarray) -> float:
     """
@@ -49,46 +140,57 @@ def calculate_hemispheric_coupling(buy_side: np.ndarray, sell_side: np.ndarray)
     """
     return calculate_coherence(buy_side, sell_side)
 
-def analyze_fractal_coherence() -> Dict[str, Any]:
+@dataclass(slots=True)
+class CoherenceReport:
+    """Multi-scale coherence report; fields serialize to the API's JSON shape as-is."""
+    timestamp: str
+    levels: Dict[str, Dict[str, Any]]       # macro / meso / micro coherence (float leaves)
+    faraday_resonance: Dict[str, float]     # Standing wave stability per asset
+    hemispheric_coupling: float             # Global coupling metric
+    emotional_intelligence: float
+
+async def analyze_fractal_coherence() -> CoherenceReport:
     """Analyzes coherence and resonance across the fractal hierarchy."""
-    results = {
-        "timestamp": pd.Timestamp.now().isoformat(),
-        "levels": {"macro": {}, "meso": {}, "micro": {}},
-        "faraday_resonance": {}, # Standing wave stability per asset
-        "hemispheric_coupling": 0.0, # Global coupling metric
-        "emotional_intelligence": 0.0
-    }
-    
-    all_symbols = [sym for sector in SECTORS.values() for sym in sector]
-    data = {sym: fetch_real_data(sym) for sym in all_symbols}
-    macro_ref = data["SPY"]["close"].values
-    
+    closes, volumes = await fetch_panel(ALL_SYMBOLS)
+    # The spectral work is CPU-bound; keep it off the event loop
+    return await asyncio.to_thread(_build_report, closes, volumes)
+
+def _build_report(closes: np.ndarray, volumes: np.ndarray) -> CoherenceReport:
+    """Builds the report tree from (closes, volumes) panels with rows in ALL_SYMBOLS order."""
+    # Panels and returns stay float32 up to the spectral kernel (which accumulates in float64);
+    # catch an upcast or strided copy at the fetch boundary
+    assert closes.dtype == volumes.dtype == np.float32 and closes.flags.c_contiguous and volumes.flags.c_contiguous
+
+    # One spectral panel holds every series the report compares:
+    # closes in rows [0, n), volumes in [n, 2n), then sector averages.
+    n = len(ALL_SYMBOLS)
+    sector_avgs = np.stack([closes[SECTOR_ROWS[sector]].mean(axis=0) for sector, _ in NON_MACRO_SECTORS])
+    returns = _log_returns(np.concatenate([closes, volumes, sector_avgs]))
+    panel = SpectralPanel(returns)
+    coh = panel.coherence_matrix()
+    stability = panel.concentration()
+
+    spy = SYM_INDEX["SPY"]
+
+    # Values are converted to Python floats with one tolist() per vector.
     # 1. Macro Analysis
-    for sym in SECTORS["Macro"]:
-        if sym != "SPY":
-            results["levels"]["macro"][f"SPY_vs_{sym}"] = calculate_coherence(macro_ref, data[sym]["close"].values)
-            
+    macro = {f"SPY_vs_{sym}": float(coh[spy, SYM_INDEX[sym]]) for sym in SECTORS["Macro"] if sym != "SPY"}
+
     # 2. Meso & Micro Analysis
-    for sector, symbols in SECTORS.items():
-        if sector == "Macro": continue
-        sector_signals = [data[sym]["close"].values for sym in symbols if data[sym] is not None]
-        if not sector_signals: continue
-        
-        sector_avg = np.mean(sector_signals, axis=0)
-        results["levels"]["meso"][f"{sector}_vs_Market"] = calculate_coherence(sector_avg, macro_ref)
-        
-        results["levels"]["micro"][sector] = {}
-        for sym in symbols:
-            stock_data = data[sym]
-            results["levels"]["micro"][sector][sym] = calculate_coherence(stock_data["close"].values, stock_data["volume"].values)
-            # Calculate Faraday Resonance for each stock
-            results["faraday_resonance"][sym] = calculate_resonance_stability(stock_data["close"].values)
-
-    # Hemispheric Coupling (Example: SPY vs QQQ as two hemispheres of the macro brain)
-    results["hemispheric_coupling"] = calculate_hemispheric_coupling(data["SPY"]["close"].values, data["QQQ"]["close"].values)
-    
-    # Emotional Intelligence
-    all_micro = [v for s in results["levels"]["micro"].values() for v in s.values()]
-    results["emotional_intelligence"] = np.mean(all_micro) if all_micro else 0.0
-    
-    return results
+    meso = {f"{sector}_vs_Market": value
+            for (sector, _), value in zip(NON_MACRO_SECTORS, coh[2 * n:, spy].tolist())}
+    micro_coh = coh[MICRO_ROWS, n + MICRO_ROWS]
+    micro_by_sym = dict(zip(MICRO_SYMBOLS, micro_coh.tolist()))
+    micro = {sector: {sym: micro_by_sym[sym] for sym in symbols} for sector, symbols in NON_MACRO_SECTORS}
+    # Faraday Resonance for each stock
+    faraday = dict(zip(MICRO_SYMBOLS, stability[MICRO_ROWS].tolist()))
+
+    return CoherenceReport(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        levels={"macro": macro, "meso": meso, "micro": micro},
+        faraday_resonance=faraday,
+        # Hemispheric Coupling (Example: SPY vs QQQ as two hemispheres of the macro brain)
+        hemispheric_coupling=float(coh[spy, SYM_INDEX["QQQ"]]),
+        # Emotional Intelligence
+        emotional_intelligence=float(micro_coh.mean()),
+    )
@@ -1,6 +1,13 @@
-from fastapi import FastAPI, Query
-from coherence_engine import analyze_fractal_coherence
-from typing import List
+import asyncio
+import time
+
+import orjson
+from fastapi import FastAPI, Query, Response
+from coherence_engine import CoherenceReport, analyze_fractal_coherence
+from typing import List, Optional
+
+# Inputs only change on fetch, so a report is reused by every request within this window
+REPORT_TTL_SECONDS = 1.0
 
 app = FastAPI(
     title="Fractal Coherence Engine API",
@@ -11,12 +18,24 @@ app = FastAPI(
 def read_root():
     return {"message": "Fractal Coherence Engine is running."}
 
+_report_task: Optional["asyncio.Task[CoherenceReport]"] = None
+_report_expires = 0.0
+
 @app.get("/coherence/report")
-def get_coherence_report():
+async def get_coherence_report():
     """
     Generates the multi-scale fractal coherence report (Macro/Meso/Micro).
+    Concurrent requests share one in-flight analysis; results are reused for REPORT_TTL_SECONDS.
     """
-    return analyze_fractal_coherence()
+    global _report_task, _report_expires
+    now = time.monotonic()
+    if _report_task is None or now >= _report_expires:
+        _report_task = asyncio.ensure_future(analyze_fractal_coherence())
+        _report_expires = now + REPORT_TTL_SECONDS
+    # Shielded so a client disconnect does not cancel the analysis for other waiters
+    report = await asyncio.shield(_report_task)
+    # orjson serializes the slotted dataclass directly, skipping jsonable_encoder
+    return Response(orjson.dumps(report), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
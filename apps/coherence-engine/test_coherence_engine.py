@@ -0,0 +1,82 @@
+import asyncio
+
+import numpy as np
+import pytest
+from scipy.signal import coherence, welch
+
+from coherence_engine import (
+    ALL_SYMBOLS, NON_MACRO_SECTORS, SECTORS, SYM_INDEX, _build_report,
+    calculate_coherence, calculate_resonance_stability, fetch_panel,
+)
+
+RNG = np.random.default_rng(0)
+PRICES_A = 100 + np.cumsum(RNG.standard_normal(128) * 0.5)
+PRICES_B = 100 + np.cumsum(RNG.standard_normal(128) * 0.5)
+# Crypto-scale prices, where log(p) is ~11-14 and nearby logs share most of their digits
+HIGH_PRICES_A = 60000 + np.cumsum(RNG.standard_normal(128) * 5)
+HIGH_PRICES_B = 1e6 + np.cumsum(RNG.standard_normal(128))
+
+
+def _scipy_coherence(s1, s2):
+    r1, r2 = np.diff(np.log(s1)), np.diff(np.log(s2))
+    return np.mean(coherence(r1, r2, fs=1.0, nperseg=min(len(r1), 64))[1])
+
+
+def _scipy_stability(series):
+    returns = np.diff(np.log(series))
+    _, psd = welch(returns, fs=1.0, nperseg=min(len(returns), 64))
+    return psd.max() / psd.sum()
+
+
+# 128 prices -> nperseg 64 (compiled radix-2 kernel); 50 prices -> nperseg 49 (rFFT fallback)
+@pytest.mark.parametrize("length", [128, 50])
+def test_matches_scipy(length):
+    a, b = PRICES_A[:length], PRICES_B[:length]
+    assert calculate_coherence(a, b) == pytest.approx(_scipy_coherence(a, b), abs=1e-4)
+    assert calculate_resonance_stability(a) == pytest.approx(_scipy_stability(a), abs=1e-4)
+
+
+@pytest.mark.parametrize("length", [128, 50])
+def test_flat_series(length):
+    flat = np.full(length, 100.0)
+    assert np.isnan(calculate_coherence(PRICES_A[:length], flat))
+    assert calculate_resonance_stability(flat) == 0.0
+
+
+@pytest.mark.parametrize("length", [128, 50])
+def test_high_prices_match_scipy(length):
+    a, b = HIGH_PRICES_A[:length], HIGH_PRICES_B[:length]
+    assert calculate_coherence(a, b) == pytest.approx(_scipy_coherence(a, b), abs=1e-4)
+    assert calculate_resonance_stability(a) == pytest.approx(_scipy_stability(a), abs=1e-4)
+    assert calculate_resonance_stability(b) == pytest.approx(_scipy_stability(b), abs=1e-4)
+
+
+def test_float64_input_keeps_float64_precision():
+    # Only the report's fetched panel is float32; the public wrappers keep the caller's dtype
+    a, b = HIGH_PRICES_A, HIGH_PRICES_B
+    assert calculate_coherence(a, b) == pytest.approx(_scipy_coherence(a, b), abs=1e-9)
+    assert calculate_resonance_stability(b) == pytest.approx(_scipy_stability(b), abs=1e-9)
+
+
+def test_report_layout_matches_pairwise_scipy():
+    # The report reads one coherence matrix by row offsets; check every entry against per-pair scipy
+    closes, volumes = asyncio.run(fetch_panel(ALL_SYMBOLS))
+    report = _build_report(closes, volumes)
+    close = {sym: closes[SYM_INDEX[sym]].astype(np.float64) for sym in ALL_SYMBOLS}
+    volume = {sym: volumes[SYM_INDEX[sym]].astype(np.float64) for sym in ALL_SYMBOLS}
+
+    for sym in SECTORS["Macro"][1:]:
+        expected = _scipy_coherence(close["SPY"], close[sym])
+        assert report.levels["macro"][f"SPY_vs_{sym}"] == pytest.approx(expected, abs=1e-4)
+    micro = []
+    for sector, symbols in NON_MACRO_SECTORS:
+        sector_avg = np.mean([close[sym] for sym in symbols], axis=0)
+        expected = _scipy_coherence(sector_avg, close["SPY"])
+        assert report.levels["meso"][f"{sector}_vs_Market"] == pytest.approx(expected, abs=1e-4)
+        for sym in symbols:
+            expected = _scipy_coherence(close[sym], volume[sym])
+            assert report.levels["micro"][sector][sym] == pytest.approx(expected, abs=1e-4)
+            assert report.faraday_resonance[sym] == pytest.approx(_scipy_stability(close[sym]), abs=1e-4)
+            micro.append(expected)
+    assert report.hemispheric_coupling == pytest.approx(_scipy_coherence(close["SPY"], close["QQQ"]), abs=1e-4)
+    assert report.emotional_intelligence == pytest.approx(np.mean(micro), abs=1e-4)